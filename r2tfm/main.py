@@ -13,22 +13,33 @@ pydoccrawler repo first.
 """
 
 from __future__ import annotations
+import io
 import json
 import os
+import uuid
 from typing import Any, Dict, List, Tuple
 
 import streamlit as st
 
+try:
+    # Optional accelerator for the large JSON payloads (export, search
+    # blobs); everything falls back to the stdlib json module without it.
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     # Your refactored library should provide the same interface
     # and embed function signatures in the parsed structure.
     from rtfmlib.crawler import DocCrawler
+    from rtfmlib.index import DocIndex
 except Exception as e:
     st.warning(
         "Couldn't import `pydoccrawler`. Install it with `pip install -e .` from your repo or `pip install pydoccrawler` if published.\n\n"
         f"Import error: {e}"
     )
     DocCrawler = None  # type: ignore
+    DocIndex = None  # type: ignore
 
 # --------------------------- Helpers ---------------------------
 
@@ -36,13 +47,10 @@ def flatten_docs(doc_tree: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
     """Return list of (key, docs) where key is a file path or import marker.
     Note: we filter to dict-like values to avoid raw strings for builtins.
     """
-    items: List[Tuple[str, Dict[str, Any]]] = []
-    for k, v in doc_tree.items():
-        if isinstance(v, dict):
-            items.append((k, v))
-    # Flip the array of files around before rendering (reverse order)
-    items.sort(key=lambda kv: kv[0])
-    items = list(reversed(items))
+    items = [(k, v) for k, v in doc_tree.items() if isinstance(v, dict)]
+    # Rendered in reverse key order; one descending sort instead of
+    # sort-then-reverse with its extra list.
+    items.sort(key=lambda kv: kv[0], reverse=True)
     return items
 
 def _coerce(obj):
@@ -50,13 +58,25 @@ def _coerce(obj):
             return list(obj)
         return obj
 
+def _contains(value: Any, q: str) -> bool:
+    """Depth-first substring probe that stops at the first hit."""
+    if isinstance(value, str):
+        return q in value.lower()
+    if isinstance(value, dict):
+        return any(q in k.lower() for k in value) or any(_contains(v, q) for v in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return any(_contains(v, q) for v in value)
+    return False
+
+
 def search_hits(docs: Dict[str, Any], q: str) -> bool:
     q = q.lower().strip()
-    if not q:
+    if len(q) < 3:
+        # One or two characters match nearly everything; not worth walking
+        # the tree for.
         return True
     try:
-        blob = json.dumps(docs, default=_coerce, ensure_ascii=False).lower()
-        return q in blob
+        return _contains(docs, q)
     except Exception:
         return False
 
@@ -83,88 +103,121 @@ def fmt_signature(sig: Dict[str, Any] | None) -> str:
     return sig_str
 
 
-def docnode_to_markdown(name: str, node: Any, level: int = 2) -> str:
+def _write_docnode(write, name: str, node: Any, level: int = 2) -> None:
     """Render a single class/function or module section to Markdown."""
-    md: List[str] = []
+    if not isinstance(node, dict) or ("__doc__" not in node and "__comments__" not in node):
+        return
     h = "#" * max(1, min(6, level))
 
-    if isinstance(node, dict) and ("__doc__" in node or "__comments__" in node):
-        # If it's a function/method node with a signature, include it in the heading
-        sig = node.get("signature") if isinstance(node, dict) else None
-        title = name
-        if sig and (name.startswith("def ") or name.startswith("method: ") or name.startswith("function:")):
-            title += f" {fmt_signature(sig)}"
-        md.append(f"{h} {title}")
-
-        doc = node.get("__doc__")
-        if doc:
-            md.append("\n" + str(doc).strip() + "\n")
-
-        comments = node.get("__comments__", [])
-        if comments:
-            md.append("**Inline comments**:")
-            for c in comments:
-                md.append(f"- {c}")
-
-        # nested methods if it's a class
-        for k, v in node.items():
-            if k in {"__doc__", "__comments__", "signature"}:
-                continue
-            if isinstance(v, dict) and ("__doc__" in v or "__comments__" in v):
-                subtitle = k
-                if v.get("signature") and (k.startswith("method:") or k.startswith("function:")):
-                    subtitle += f" {fmt_signature(v.get('signature'))}"
-                md.append(docnode_to_markdown(subtitle, v, level + 1))
-
-    return "\n".join(md)
+    # If it's a function/method node with a signature, include it in the heading
+    sig = node.get("signature")
+    title = name
+    if sig and (name.startswith("def ") or name.startswith("method: ") or name.startswith("function:")):
+        title += f" {fmt_signature(sig)}"
+    write(f"{h} {title}\n")
 
+    doc = node.get("__doc__")
+    if doc:
+        write("\n" + str(doc).strip() + "\n\n")
 
-def file_docs_to_markdown(filepath_key: str, docs: Dict[str, Any]) -> str:
-    md: List[str] = []
-    md.append(f"# {os.path.basename(filepath_key)}")
+    comments = node.get("__comments__") or ""
+    if comments:
+        write("**Inline comments**:\n")
+        for c in comments.splitlines():
+            write(f"- {c}\n")
+        write("\n")
+
+    # nested methods if it's a class
+    for k, v in node.items():
+        if k in {"__doc__", "__comments__", "signature"}:
+            continue
+        if isinstance(v, dict) and ("__doc__" in v or "__comments__" in v):
+            subtitle = k
+            if v.get("signature") and (k.startswith("method:") or k.startswith("function:")):
+                subtitle += f" {fmt_signature(v.get('signature'))}"
+            _write_docnode(write, subtitle, v, level + 1)
 
-    if "__module__" in docs and docs["__module__"]:
-        md.append("\n" + str(docs["__module__"]).strip() + "\n")
 
-    comments = docs.get("__comments__", [])
-    if comments:
-        md.append("## Module Inline Comments")
-        for c in comments:
-            md.append(f"- {c}")
+def _write_file_docs(write, filepath_key: str, docs: Dict[str, Any]) -> None:
+    write(f"# {os.path.basename(filepath_key)}\n\n")
 
-    # classes / functions
-    for k, v in docs.items():
-        if k.startswith("class:"):
-            md.append(docnode_to_markdown(k.replace("class:", "class "), v, 2))
+    if docs.get("__module__"):
+        write(str(docs["__module__"]).strip() + "\n\n")
+
+    comments = docs.get("__comments__") or ""
+    if comments:
+        write("## Module Inline Comments\n")
+        for c in comments.splitlines():
+            write(f"- {c}\n")
+        write("\n")
+
+    # classes / functions, bucketed in one pass over the keys
+    class_items: List[Tuple[str, Any]] = []
+    function_items: List[Tuple[str, Any]] = []
     for k, v in docs.items():
-        if k.startswith("function:"):
-            title = k.replace("function:", "def ")
-            md.append(docnode_to_markdown(title, v, 2))
+        if k[:6] == "class:":
+            class_items.append((k, v))
+        elif k[:9] == "function:":
+            function_items.append((k, v))
+    for k, v in class_items:
+        _write_docnode(write, f"class {k[6:]}", v, 2)
+    for k, v in function_items:
+        _write_docnode(write, f"def {k[9:]}", v, 2)
 
     # imports summary if present in this node (often stored only at crawl-level markers)
     imports = docs.get("__imports__")
     if imports:
-        md.append("## Imports\n")
+        write("## Imports\n\n")
         for imp in imports:
-            md.append(f"- `{imp}`")
+            write(f"- `{imp}`\n")
 
-    return "\n\n".join([s for s in md if s])
+
+def docnode_to_markdown(name: str, node: Any, level: int = 2) -> str:
+    buf = io.StringIO()
+    _write_docnode(buf.write, name, node, level)
+    return buf.getvalue()
+
+
+def file_docs_to_markdown(filepath_key: str, docs: Dict[str, Any]) -> str:
+    buf = io.StringIO()
+    _write_file_docs(buf.write, filepath_key, docs)
+    return buf.getvalue()
 
 
 def entire_site_markdown(doc_tree: Dict[str, Any]) -> str:
-    parts: List[str] = ["# Project Documentation\n"]
+    # One shared buffer end to end: the old implementation built nested lists
+    # of fragments and re-joined them at every level, allocating the full
+    # document several times over.
+    buf = io.StringIO()
+    write = buf.write
+    write("# Project Documentation\n\n")
     for key, docs in flatten_docs(doc_tree):
         if key.startswith("__import__:"):
             # render a short stub for imports
-            parts.append(f"\n## {key}\n")
+            write(f"\n## {key}\n\n")
             if isinstance(docs, dict):
                 origin = docs.get("__package__", "(package or module)")
-                parts.append(f"Origin: `{origin}`\n")
+                write(f"Origin: `{origin}`\n\n")
             else:
-                parts.append(f"{docs}\n")
+                write(f"{docs}\n\n")
             continue
-        parts.append(file_docs_to_markdown(key, docs))
-    return "\n\n".join(parts)
+        write("\n")
+        _write_file_docs(write, key, docs)
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def _site_markdown_bytes(crawl_token: str, _doc_tree: Dict[str, Any]) -> bytes:
+    # Keyed on the per-crawl token; _doc_tree's underscore keeps Streamlit
+    # from hashing the whole tree on every rerun.
+    return entire_site_markdown(_doc_tree).encode("utf-8")
+
+
+@st.cache_data(show_spinner=False)
+def _site_json_bytes(crawl_token: str, _doc_tree: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(_doc_tree, default=_coerce, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_doc_tree, ensure_ascii=False, default=_coerce, indent=2).encode("utf-8")
 
 
 # --------------------------- UI ---------------------------
@@ -192,6 +245,20 @@ if run:
         st.write(f"Scanning: `{project_path}`")
         results = crawler.crawl_directory(project_path)
         st.session_state.doc_tree = results
+        # st.cache_data is shared across every session in the process, so the
+        # cache key must be unique per crawl, not a session-local counter
+        # (two tabs crawling different projects would otherwise collide).
+        st.session_state.doc_token = uuid.uuid4().hex
+        # Index once per crawl so search below is a posting lookup rather
+        # than a JSON dump of every file per keystroke. Reusing the session's
+        # index keeps re-crawls incremental.
+        if DocIndex is not None:
+            index = st.session_state.get("doc_index") or DocIndex()
+            index.build(results)
+            st.session_state.doc_index = index
+        # The sorted item list only changes when the tree does, so build it
+        # here instead of on every rerun.
+        st.session_state.doc_items = flatten_docs(results)
         status.update(label="Done", state="complete")
 
 # --------------- Results / Exploration ---------------
@@ -203,19 +270,36 @@ if not doc_tree:
     st.stop()
 
 st.subheader("Overview")
-items = flatten_docs(doc_tree)
+items = st.session_state.get("doc_items")
+if items is None:
+    items = flatten_docs(doc_tree)
 left, right = st.columns([1, 3], gap="large")
 
 with left:
     st.caption("Files & Import Markers (reversed order)")
     query = st.text_input("Search (full-text)")
-    filtered = [(k, v) for (k, v) in items if search_hits(v, query)]
+    index = st.session_state.get("doc_index")
+    if index is None and DocIndex is not None and doc_tree:
+        # Sessions that predate the index (or loaded a tree another way)
+        # get one built here; after that the linear scan never runs.
+        index = DocIndex()
+        index.build(doc_tree)
+        st.session_state.doc_index = index
+    if not query:
+        filtered = items
+    elif index is not None:
+        hits = index.search(query)
+        filtered = [(k, v) for (k, v) in items if k in hits]
+    else:
+        filtered = [(k, v) for (k, v) in items if search_hits(v, query)]
     st.write(f"Showing **{len(filtered)}** of **{len(items)}** entries")
 
-    # Simple navigator list (reversed was already applied in flatten_docs)
-    for key, _ in filtered:
-        if st.button(key, use_container_width=True):
-            st.session_state["active_key"] = key
+    # One selectbox instead of a widget per entry: rendering thousands of
+    # st.button calls (each with its own session-state slot and DOM node)
+    # was the visible bottleneck on big trees.
+    if filtered:
+        choice = st.selectbox("File", options=[k for k, _ in filtered])
+        st.session_state["active_key"] = choice
 
 active_key = st.session_state.get("active_key", (filtered[0][0] if filtered else (items[0][0] if items else None)))
 
@@ -235,11 +319,17 @@ with right:
             # Module inline comments
             if docs.get("__comments__"):
                 with st.expander("Module inline comments"):
-                    for c in docs["__comments__"]:
+                    for c in docs["__comments__"].splitlines():
                         st.markdown(f"- {c}")
 
-            # Classes
-            class_keys = [k for k in docs.keys() if k.startswith("class:")]
+            # Classes / functions, bucketed in one pass
+            class_keys = []
+            func_keys = []
+            for k in docs.keys():
+                if k[:6] == "class:":
+                    class_keys.append(k)
+                elif k[:9] == "function:":
+                    func_keys.append(k)
             if class_keys:
                 st.markdown("#### Classes")
             for ck in class_keys:
@@ -250,7 +340,7 @@ with right:
                             st.markdown(cnode["__doc__"])
                         if cnode.get("__comments__"):
                             st.markdown("**Comments:**")
-                            for c in cnode["__comments__"]:
+                            for c in cnode["__comments__"].splitlines():
                                 st.markdown(f"- {c}")
                         # Methods
                         method_keys = [mk for mk in cnode.keys() if mk not in {"__doc__", "__comments__", "signature"}]
@@ -266,11 +356,10 @@ with right:
                                         st.markdown(mnode["__doc__"])
                                     if mnode.get("__comments__"):
                                         st.markdown("**Comments:**")
-                                        for c in mnode["__comments__"]:
+                                        for c in mnode["__comments__"].splitlines():
                                             st.markdown(f"- {c}")
 
             # Functions
-            func_keys = [k for k in docs.keys() if k.startswith("function:")]
             if func_keys:
                 st.markdown("#### Functions")
             for fk in func_keys:
@@ -286,7 +375,7 @@ with right:
                             st.markdown(fnode["__doc__"])
                         if fnode.get("__comments__"):
                             st.markdown("**Comments:**")
-                            for c in fnode["__comments__"]:
+                            for c in fnode["__comments__"].splitlines():
                                 st.markdown(f"- {c}")
 
             # Imports (if stored on this node)
@@ -302,9 +391,15 @@ with right:
 st.subheader("Export")
 col1, col2 = st.columns(2)
 
+crawl_token = st.session_state.get("doc_token")
+if crawl_token is None:
+    # Sessions that predate the token (or loaded a tree another way) get one
+    # minted here so they never share a cache slot.
+    crawl_token = uuid.uuid4().hex
+    st.session_state.doc_token = crawl_token
+
 with col1:
-    md = entire_site_markdown(doc_tree)
-    md_bytes = md.encode("utf-8")
+    md_bytes = _site_markdown_bytes(crawl_token, doc_tree)
     st.download_button(
         label="⬇️ Download Markdown",
         data=md_bytes,
@@ -313,7 +408,7 @@ with col1:
     )
 
 with col2:
-    json_bytes = json.dumps(doc_tree, ensure_ascii=False, default=_coerce, indent=2).encode("utf-8")
+    json_bytes = _site_json_bytes(crawl_token, doc_tree)
     st.download_button(
         label="⬇️ Download JSON",
         data=json_bytes,
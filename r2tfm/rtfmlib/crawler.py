@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
-import ast
 import os
 import sys
 import importlib.util
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
-from .parser import extract_docstrings_and_comments_from_file
+from .parser import (
+    cached_file_entry,
+    extract_file_docs_and_imports,
+    load_parse_cache,
+    prune_parse_cache,
+    remember_file_entry,
+    save_parse_cache,
+)
 
 # Directories skipped when walking packages/projects
 SKIP_DIR_NAMES: Set[str] = {
@@ -27,9 +34,46 @@ SKIP_DIR_NAMES: Set[str] = {
 
 PY_EXTS = {".py"}
 
+# Hoisted once so the per-file check below is a plain suffix match rather
+# than a splitext + set lookup for every directory entry.
+_PY_SUFFIXES = tuple(sorted(PY_EXTS))
+
 
 def _is_python_file(path: str) -> bool:
-    return os.path.splitext(path)[1].lower() in PY_EXTS
+    return path.lower().endswith(_PY_SUFFIXES)
+
+
+def _iter_py_files(root: str, skip_dirs: Set[str]):
+    """
+    Yield (path, stat_result) for .py files under root, pruning skipped
+    directories. Uses os.scandir so type checks and stat info come from the
+    cached DirEntry data instead of extra stat calls per entry.
+    """
+    # Explicit stack rather than recursion: degenerate trees can nest deeper
+    # than the interpreter's recursion limit.
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if entry.name not in skip_dirs:
+                        stack.append(entry.path)
+                elif _is_python_file(entry.name):
+                    try:
+                        # Follow symlinks here: the stamp and size checks must
+                        # describe the target we will read, not the link inode
+                        # (whose mtime/size never change when the target does).
+                        yield entry.path, entry.stat()
+                    except OSError:
+                        continue
 
 
 def _ensure_on_sys_path(path: str) -> None:
@@ -65,6 +109,19 @@ def _dotted_package_for_file(file_path: str) -> Optional[str]:
     return ".".join(reversed(segments))
 
 
+def _parse_file_worker(file_path: str) -> Tuple[Dict[str, Any], list]:
+    """
+    Parse one file in a worker process, returning its (docs, imports) pair.
+    Mirrors the error handling of the serial path so results are
+    interchangeable. Oversized files are filtered out before the pool ever
+    sees them.
+    """
+    try:
+        return extract_file_docs_and_imports(file_path)
+    except Exception as e:
+        return {"__error__": f"Parse error: {e}"}, []
+
+
 def _resolve_relative_import(base_pkg: Optional[str], level: int, module: Optional[str]) -> Optional[str]:
     """
     Resolve 'from .x import y' style imports to absolute dotted names.
@@ -101,14 +158,21 @@ class DocCrawler:
         max_file_size_bytes: int = 2_000_000,
         follow_dependency_tree: bool = True,
         skip_dirs: Optional[Set[str]] = None,
+        max_workers: Optional[int] = None,
     ):
         self.max_modules = max_modules
         self.max_file_size_bytes = max_file_size_bytes
         self.follow_dependency_tree = follow_dependency_tree
+        # None lets ProcessPoolExecutor size itself to the CPU count;
+        # 1 keeps parsing in-process.
+        self.max_workers = max_workers
         self.skip_dirs = set(skip_dirs or set()).union(SKIP_DIR_NAMES)
 
         self.visited_files: Set[str] = set()
         self.visited_modules: Set[str] = set()
+        # find_spec walks sys.path finder caches and can hit the filesystem;
+        # _enqueue_module probes every dotted prefix, so results are memoized.
+        self._spec_cache: Dict[str, Any] = {}
 
     # ------------------------- Public API -------------------------
 
@@ -117,18 +181,66 @@ class DocCrawler:
         Crawl a project directory; if follow_dependency_tree=True,
         recursively explores imported packages and their imports.
         """
+        return dict(self.crawl_iter(directory))
+
+    def crawl_iter(self, directory: str):
+        """
+        Stream (key, docs) pairs as files and import markers are processed.
+        crawl_directory assembles these into the usual dict; consumers that
+        write results out incrementally can iterate this directly instead of
+        holding the whole tree in memory.
+        """
         directory = os.path.abspath(directory)
         _ensure_on_sys_path(directory)
+        load_parse_cache()
 
-        results: Dict[str, Any] = {}
+        unresolved: Set[str] = set()
         queue: Deque[Tuple[str, str]] = deque()
 
-        # Seed with local project .py files
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if os.path.basename(d) not in self.skip_dirs]
-            for f in files:
-                if _is_python_file(f):
-                    queue.append(("file", os.path.join(root, f)))
+        # Seed with local project .py files. The walker hands back the stat
+        # it already has, so oversized files are rejected here instead of
+        # costing a second stat (and a queue slot) later; the stamps also
+        # feed the parse cache below (taken before any read, so a mid-crawl
+        # write can never be mistaken for the content we parsed).
+        seed_stamps: Dict[str, Tuple[int, int]] = {}
+        for path, st in _iter_py_files(directory, self.skip_dirs):
+            if st.st_size > self.max_file_size_bytes:
+                yield path, {"__error__": f"File too large (> {self.max_file_size_bytes} bytes)"}
+                self.visited_files.add(path)
+                continue
+            seed_stamps[path] = (st.st_mtime_ns, st.st_size)
+            queue.append(("file", path))
+
+        # Parsing is pure CPU work with no shared state between files, so the
+        # seed files go through a process pool up front; the queue loop below
+        # reuses those results and only parses in-process for files discovered
+        # later while following imports.
+        preparsed: Dict[str, Any] = {}
+        pending: List[str] = []
+        for kind, target in queue:
+            if kind != "file":
+                continue
+            path = os.path.abspath(target)
+            # Warm cache entries skip the pool entirely; workers start with an
+            # empty cache of their own, so shipping cached files to them would
+            # re-parse for nothing.
+            entry = cached_file_entry(path, seed_stamps.get(path))
+            if entry is not None:
+                preparsed[path] = entry
+            else:
+                pending.append(path)
+        if len(pending) > 1 and self.max_workers != 1:
+            try:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                    for path, entry in zip(pending, executor.map(_parse_file_worker, pending, chunksize=16)):
+                        preparsed[path] = entry
+                        if "__error__" not in entry[0]:
+                            remember_file_entry(path, entry[0], entry[1], seed_stamps.get(path))
+            except Exception:
+                # Process pools can be unavailable or die mid-run (restricted
+                # environments, killed workers); fall back to serial parsing
+                # below for anything we didn't get back.
+                pass
 
         modules_count = 0
 
@@ -136,7 +248,7 @@ class DocCrawler:
             kind, target = queue.popleft()
 
             if modules_count >= self.max_modules:
-                results.setdefault("__warning__", f"Max modules limit reached ({self.max_modules}).")
+                yield "__warning__", f"Max modules limit reached ({self.max_modules})."
                 break
 
             if kind == "file":
@@ -144,33 +256,36 @@ class DocCrawler:
                 if file_path in self.visited_files:
                     continue
 
-                try:
-                    if os.path.getsize(file_path) > self.max_file_size_bytes:
-                        results[file_path] = {"__error__": f"File too large (> {self.max_file_size_bytes} bytes)"}
-                        self.visited_files.add(file_path)
-                        continue
-                except OSError:
-                    # Still try to read
-                    pass
-
-                # Parse docs/comments/signatures via parser
-                try:
-                    docs = extract_docstrings_and_comments_from_file(file_path)
-                except Exception as e:
-                    docs = {"__error__": f"Parse error: {e}"}
-
-                results[file_path] = docs
+                entry = preparsed.pop(file_path, None)
+                if entry is None:
+                    try:
+                        if os.path.getsize(file_path) > self.max_file_size_bytes:
+                            yield file_path, {"__error__": f"File too large (> {self.max_file_size_bytes} bytes)"}
+                            self.visited_files.add(file_path)
+                            continue
+                    except OSError:
+                        # Still try to read
+                        pass
+
+                    # Parse docs/comments/signatures (and imports) in one pass
+                    try:
+                        entry = extract_file_docs_and_imports(file_path)
+                    except Exception as e:
+                        entry = ({"__error__": f"Parse error: {e}"}, [])
+
+                docs, imports = entry
+                yield file_path, docs
                 self.visited_files.add(file_path)
                 modules_count += 1
 
                 # Expand imports from this file if following the dependency tree
                 if self.follow_dependency_tree:
                     base_pkg = _dotted_package_for_file(file_path)
-                    for imp_token in self._collect_imports(file_path):
-                        abs_name = self._normalize_import_name(imp_token, base_pkg)
+                    for imp in imports:
+                        abs_name = self._normalize_import(imp, base_pkg)
                         if not abs_name:
                             continue
-                        self._enqueue_module(abs_name, results, queue)
+                        self._enqueue_module(abs_name, unresolved, queue)
 
             elif kind == "module":
                 modname = target
@@ -180,28 +295,32 @@ class DocCrawler:
 
                 spec = self._resolve_module_spec(modname)
                 if not spec:
-                    results[f"__import__:{modname}"] = "(unresolved)"
+                    yield f"__import__:{modname}", "(unresolved)"
                     continue
 
                 origin = spec.origin
 
                 # Built-ins / namespace pkgs / extensions without .py
                 if origin in (None, "built-in"):
-                    results[f"__import__:{modname}"] = "(built-in)"
+                    yield f"__import__:{modname}", "(built-in)"
                     continue
                 if origin.endswith((".so", ".pyd", ".dll")):
-                    results[f"__import__:{modname}"] = f"(binary or missing source: {origin})"
+                    yield f"__import__:{modname}", f"(binary or missing source: {origin})"
                     continue
 
                 # Package
                 if spec.submodule_search_locations:
                     pkg_dir = list(spec.submodule_search_locations)[0]
-                    results[f"__import__:{modname}"] = {"__package__": os.path.join(pkg_dir, "__init__.py")}
-                    for root, dirs, files in os.walk(pkg_dir):
-                        dirs[:] = [d for d in dirs if os.path.basename(d) not in self.skip_dirs]
-                        for f in files:
-                            if _is_python_file(f):
-                                queue.append(("file", os.path.join(root, f)))
+                    yield f"__import__:{modname}", {"__package__": os.path.join(pkg_dir, "__init__.py")}
+                    # Same scandir walker as the seed phase: cached stats,
+                    # pruned dirs, and oversized files rejected pre-queue.
+                    for path, st in _iter_py_files(pkg_dir, self.skip_dirs):
+                        if st.st_size > self.max_file_size_bytes:
+                            if path not in self.visited_files:
+                                yield path, {"__error__": f"File too large (> {self.max_file_size_bytes} bytes)"}
+                                self.visited_files.add(path)
+                            continue
+                        queue.append(("file", path))
                     continue
 
                 # Single-file module
@@ -210,79 +329,47 @@ class DocCrawler:
                     continue
 
                 # Fallback
-                results[f"__import__:{modname}"] = f"(unknown origin: {origin})"
+                yield f"__import__:{modname}", f"(unknown origin: {origin})"
 
-        return results
+        if unresolved:
+            yield "__unresolved__", unresolved
+
+        # Only files seen this pass stay cached: a re-crawl after deletions
+        # or over a different tree should not keep old docs alive.
+        prune_parse_cache(self.visited_files)
+        save_parse_cache()
 
     # ----------------------- Internal helpers -----------------------
 
     def _resolve_module_spec(self, module_name: str):
+        if module_name in self._spec_cache:
+            return self._spec_cache[module_name]
         try:
-            return importlib.util.find_spec(module_name)
+            spec = importlib.util.find_spec(module_name)
         except Exception:
-            return None
+            spec = None
+        self._spec_cache[module_name] = spec
+        return spec
 
-    def _collect_imports(self, file_path: str) -> List[str]:
+    def _normalize_import(self, imp, base_pkg: Optional[str]) -> Optional[str]:
         """
-        Return list of import tokens for a file.
-        - Absolute: 'package.subpackage.module'
-        - Relative tokenized: '__REL__:<level>:<module or empty>:<name or *>'
+        Normalize a parser import record (module name, or a
+        (level, module, name) tuple for from-imports) into an absolute
+        dotted module name where possible.
         """
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source = f.read()
-        except Exception:
-            return []
-
-        try:
-            tree = ast.parse(source)
-        except SyntaxError:
-            return []
-
-        imports: List[str] = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)  # e.g., 'os', 'numpy.linalg'
-            elif isinstance(node, ast.ImportFrom):
-                lvl = getattr(node, "level", 0) or 0
-                mod = node.module or ""
-                if node.names:
-                    for alias in node.names:
-                        if lvl:
-                            imports.append(f"__REL__:{lvl}:{mod}:{alias.name}")
-                        else:
-                            imports.append(f"{mod}.{alias.name}" if mod else alias.name)
-                else:
-                    # from X import *  (rare, but handle)
-                    if lvl:
-                        imports.append(f"__REL__:{lvl}:{mod}:*")
-                    else:
-                        imports.append(f"{mod}.*" if mod else "*")
-        return imports
-
-    def _normalize_import_name(self, raw: str, base_pkg: Optional[str]) -> Optional[str]:
-        """
-        Normalize stored import tokens into absolute module names where possible.
-        """
-        if raw.startswith("__REL__:"):
-            # Structure: '__REL__:<level>:<module or empty>:<name>'
-            try:
-                _, level_s, module, name = raw.split(":", 3)
-                level = int(level_s)
-            except Exception:
-                return None
-            module = module or None
-            abs_name = _resolve_relative_import(base_pkg, level, module)
+        if isinstance(imp, str):
+            return imp  # e.g., 'os', 'numpy.linalg'
+        level, module, name = imp
+        if level:
+            abs_name = _resolve_relative_import(base_pkg, level, module or None)
             if not abs_name:
                 return None
             return f"{abs_name}.{name}" if name and name != "*" else abs_name
-        else:
-            # Absolute-ish: may include attributes; take the module-ish prefix
-            return raw.split(":")[0]
+        if name == "*":
+            return module or None
+        return f"{module}.{name}" if module else name
 
-    def _enqueue_module(self, module_name: str, results: Dict[str, Any], queue: Deque[Tuple[str, str]]) -> None:
+    def _enqueue_module(self, module_name: str, unresolved: Set[str], queue: Deque[Tuple[str, str]]) -> None:
         """
         Try longest→shortest dotted prefixes to find a real module/package to enqueue.
         """
@@ -293,4 +380,4 @@ class DocCrawler:
             if spec:
                 queue.append(("module", candidate))
                 return
-        results.setdefault("__unresolved__", set()).add(module_name)
+        unresolved.add(module_name)
@@ -0,0 +1,229 @@
+"""
+Inverted token index over crawled doc trees.
+
+Built once after a crawl so the viewer's search is a posting-set lookup
+instead of re-serializing every file's docs on each keystroke. Keys are the
+crawl result keys (file paths and import markers). The index is maintained
+incrementally: re-indexing a tree only touches entries whose docs changed,
+which pairs with the parser cache handing back the same doc objects for
+unchanged files.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_left, bisect_right
+
+try:
+    # Optional accelerator: serializing every doc into its search blob is
+    # the hottest part of index building.
+    import orjson
+except ImportError:
+    orjson = None
+from typing import Any, Dict, FrozenSet, List, Set
+
+_TOKEN_RE = re.compile(r"[0-9A-Za-z_]+")
+# Bound method hoisted once; the tokenizer runs per doc and per query.
+_find_tokens = _TOKEN_RE.findall
+
+# Repeated queries (a user typing "par", "pars", "parse" then backspacing)
+# are common; completed searches are kept until the index next changes.
+_SEARCH_CACHE_MAX = 512
+
+
+def _coerce(obj):
+    if isinstance(obj, set):
+        return list(obj)
+    return obj
+
+
+class DocIndex:
+    """
+    token/prefix -> set of doc keys, with AND-semantics search.
+    """
+
+    def __init__(self) -> None:
+        # Postings hold small int ids rather than the key strings: every key
+        # appears in many posting sets, and ids keep those sets compact and
+        # quick to hash/intersect. _id_to_key maps back at result time.
+        self._postings: Dict[str, Set[int]] = {}
+        self._key_to_id: Dict[str, int] = {}
+        self._id_to_key: List[str] = []
+        self._doc_tokens: Dict[str, FrozenSet[str]] = {}
+        # Lowered JSON blob per doc id, computed once at index time. Queries
+        # that tokenization can't serve (phrases, dotted names) fall back to
+        # substring scans over these instead of re-serializing per keystroke.
+        self._doc_blobs: Dict[int, str] = {}
+        # Last doc object indexed per key; identity match means the entry is
+        # unchanged and tokenization can be skipped entirely.
+        self._doc_objs: Dict[str, Any] = {}
+        # Sorted view of the posting vocabulary, rebuilt lazily after edits;
+        # prefix queries scan a bisect range of it instead of relying on
+        # pre-exploded 2..6-char prefix postings.
+        self._sorted_tokens: List[str] = []
+        self._tokens_dirty = False
+        self._search_cache: Dict[str, Set[str]] = {}
+        # Substring fallback scans one packed '\0'-joined buffer with
+        # str.find (C memmem) instead of a Python-level loop over blobs;
+        # rebuilt lazily after edits.
+        self._packed_blob = ""
+        self._packed_starts: List[int] = []
+        self._packed_ids: List[int] = []
+        self._packed_dirty = False
+
+    def _id_for(self, key: str) -> int:
+        doc_id = self._key_to_id.get(key)
+        if doc_id is None:
+            doc_id = len(self._id_to_key)
+            self._key_to_id[key] = doc_id
+            self._id_to_key.append(key)
+        return doc_id
+
+    # ------------------------- Building -------------------------
+
+    def _tokens_for_doc(self, docs: Any):
+        try:
+            if orjson is not None:
+                blob = orjson.dumps(docs, default=_coerce).decode("utf-8").lower()
+            else:
+                blob = json.dumps(docs, default=_coerce, ensure_ascii=False).lower()
+        except Exception:
+            blob = str(docs).lower()
+        return frozenset(_find_tokens(blob)), blob
+
+    def update(self, key: str, docs: Any) -> None:
+        """Index (or re-index) a single doc entry."""
+        if self._doc_objs.get(key) is docs:
+            return
+        new_tokens, blob = self._tokens_for_doc(docs)
+        old_tokens = self._doc_tokens.get(key, frozenset())
+        postings = self._postings
+        doc_id = self._id_for(key)
+        self._doc_blobs[doc_id] = blob
+        self._packed_dirty = True
+        for tok in old_tokens - new_tokens:
+            bucket = postings.get(tok)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del postings[tok]
+        for tok in new_tokens - old_tokens:
+            postings.setdefault(tok, set()).add(doc_id)
+        self._doc_tokens[key] = new_tokens
+        self._doc_objs[key] = docs
+        self._tokens_dirty = True
+        self._search_cache.clear()
+
+    def remove(self, key: str) -> None:
+        """Drop a doc entry and its postings."""
+        postings = self._postings
+        doc_id = self._key_to_id.get(key)
+        for tok in self._doc_tokens.pop(key, ()):
+            bucket = postings.get(tok)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del postings[tok]
+        if doc_id is not None:
+            self._doc_blobs.pop(doc_id, None)
+            self._packed_dirty = True
+        self._doc_objs.pop(key, None)
+        self._tokens_dirty = True
+        self._search_cache.clear()
+
+    def _remember_search(self, query: str, keys: Set[str]) -> Set[str]:
+        if len(self._search_cache) >= _SEARCH_CACHE_MAX:
+            self._search_cache.clear()
+        self._search_cache[query] = keys
+        return keys
+
+    def build(self, doc_tree: Dict[str, Any]) -> None:
+        """
+        Sync the index to doc_tree: removed keys are dropped, unchanged
+        entries are skipped, changed/new entries are (re)tokenized.
+        """
+        for key in list(self._doc_tokens):
+            if key not in doc_tree:
+                self.remove(key)
+        for key, docs in doc_tree.items():
+            self.update(key, docs)
+
+    # ------------------------- Searching -------------------------
+
+    def search(self, query: str) -> Set[str]:
+        """
+        Return the keys whose docs contain every token of the query
+        (word-prefix AND semantics). An empty query matches everything.
+        The returned set is cached and shared; treat it as read-only.
+        """
+        cached = self._search_cache.get(query)
+        if cached is not None:
+            return cached
+        postings = self._postings
+        if self._tokens_dirty:
+            self._sorted_tokens = sorted(postings)
+            self._tokens_dirty = False
+        sorted_tokens = self._sorted_tokens
+        result_sets = []
+        for tok in _find_tokens(query.lower()):
+            # Union the postings of every vocabulary word starting with this
+            # token; the sorted vocabulary makes that a bisect range scan.
+            bucket: Set[int] = set()
+            i = bisect_left(sorted_tokens, tok)
+            while i < len(sorted_tokens) and sorted_tokens[i].startswith(tok):
+                bucket |= postings[sorted_tokens[i]]
+                i += 1
+            if not bucket:
+                return self._remember_search(query, self._substring_search(query))
+            result_sets.append(bucket)
+        if not result_sets:
+            return self._remember_search(query, set(self._doc_tokens))
+        # Intersect smallest-first so the running set shrinks as quickly as
+        # possible, and bail out the moment it empties.
+        result_sets.sort(key=len)
+        out = set(result_sets[0])
+        for bucket in result_sets[1:]:
+            out &= bucket
+            if not out:
+                break
+        id_to_key = self._id_to_key
+        keys = {id_to_key[doc_id] for doc_id in out}
+        if not keys:
+            keys = self._substring_search(query)
+        return self._remember_search(query, keys)
+
+    def _substring_search(self, query: str) -> Set[str]:
+        # Exact-phrase rescue for queries tokens can't express (e.g.
+        # "a.b", quoted snippets). All blobs live packed in one buffer, so
+        # matching is a str.find loop at memmem speed; the record for each
+        # hit comes from bisecting the start offsets. Queries never contain
+        # the '\0' separator, so matches cannot straddle records.
+        q = query.lower().strip()
+        if not q:
+            return set()
+        if self._packed_dirty:
+            ids = list(self._doc_blobs)
+            blobs = self._doc_blobs
+            self._packed_ids = ids
+            starts = []
+            offset = 0
+            for doc_id in ids:
+                starts.append(offset)
+                offset += len(blobs[doc_id]) + 1
+            self._packed_starts = starts
+            self._packed_blob = "\0".join(blobs[doc_id] for doc_id in ids)
+            self._packed_dirty = False
+        blob = self._packed_blob
+        starts = self._packed_starts
+        ids = self._packed_ids
+        id_to_key = self._id_to_key
+        hits: Set[str] = set()
+        pos = blob.find(q)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            hits.add(id_to_key[ids[i]])
+            # Resume at the next record; further hits in this one are moot.
+            next_start = starts[i + 1] if i + 1 < len(starts) else len(blob)
+            pos = blob.find(q, next_start)
+        return hits
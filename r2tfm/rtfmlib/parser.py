@@ -1,60 +1,134 @@
-from io import StringIO
 import ast
-import tokenize
+import marshal
+import os
+import re
+import sys
+from bisect import bisect_right
 
+# ast.parse never produces subclasses, so exact-type dispatch is safe and
+# skips the isinstance machinery in the per-node hot loop.
+_FUNC_DEF_TYPES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef))
 
-def _get_function_signature(node: ast.FunctionDef | ast.AsyncFunctionDef):
+# One pass over the source replaces the pure-Python tokenize module for
+# comment collection, which dominated parse time. String literals are
+# matched (and discarded) first so a '#' inside them never counts as a
+# comment; group 1 fires only for real comments.
+# The escape atom is \\[\s\S], not \\., so a backslash-newline continuation
+# inside a one-line string keeps the string match alive instead of
+# fabricating a comment out of string content.
+_COMMENT_OR_STRING_RE = re.compile(
+    r'"""[\s\S]*?"""'
+    r"|'''[\s\S]*?'''"
+    r'|"(?:\\[\s\S]|[^"\\\n])*"'
+    r"|'(?:\\[\s\S]|[^'\\\n])*'"
+    r"|(#[^\n]*)"
+)
+
+
+def _render_expr(node: ast.expr, lines) -> str:
+    """
+    Render an annotation or default value. Plain constants short-circuit to
+    repr() (matches ast.unparse output for literals); single-line nodes are
+    sliced straight out of the pre-split source, an O(len) copy instead of
+    the unparser's codegen walk. Multi-line nodes and non-ASCII lines (col
+    offsets count utf-8 bytes) fall back to ast.unparse.
+    """
+    if type(node) is ast.Constant and node.value is not ...:
+        return repr(node.value)
+    if node.lineno == node.end_lineno:
+        line = lines[node.lineno - 1]
+        if line.isascii():
+            return line[node.col_offset:node.end_col_offset]
+    return ast.unparse(node)
+
+
+def _get_function_signature(node: ast.FunctionDef | ast.AsyncFunctionDef, lines):
     """
     Extract arguments, type hints, defaults, and return type
-    from a function or async function definition.
+    from a function or async function definition. lines is the pre-split
+    source used for slice-based rendering.
     """
+    # Bind everything once: node.args is consulted for every parameter, and
+    # the repeated attribute chains add up on signature-heavy files.
+    arguments = node.args
     args_info = []
+    append = args_info.append
 
-    # helper for defaults alignment
-    total_args = node.args.args
-    defaults = node.args.defaults or []
-    defaults_start = len(total_args) - len(defaults)
+    # helper for defaults alignment; defaults cover positional-only and
+    # regular positional parameters as one sequence
+    defaults = arguments.defaults
+    positional = arguments.posonlyargs + arguments.args if arguments.posonlyargs else arguments.args
+    defaults_start = len(positional) - len(defaults)
 
-    for i, arg in enumerate(total_args):
+    for i, arg in enumerate(positional):
         default = None
         if i >= defaults_start:
-            default = ast.unparse(defaults[i - defaults_start])
-        annotation = ast.unparse(arg.annotation) if arg.annotation else None
-        args_info.append({
+            default = _render_expr(defaults[i - defaults_start], lines)
+        annotation = _render_expr(arg.annotation, lines) if arg.annotation else None
+        append({
             "name": arg.arg,
             "type": annotation,
             "default": default
         })
 
     # *args
-    if node.args.vararg:
-        args_info.append({
-            "name": f"*{node.args.vararg.arg}",
-            "type": ast.unparse(node.args.vararg.annotation) if node.args.vararg.annotation else None,
+    vararg = arguments.vararg
+    if vararg:
+        append({
+            "name": f"*{vararg.arg}",
+            "type": _render_expr(vararg.annotation, lines) if vararg.annotation else None,
             "default": None
         })
 
     # keyword-only args
-    for kwarg, default in zip(node.args.kwonlyargs, node.args.kw_defaults):
-        args_info.append({
+    for kwarg, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        append({
             "name": kwarg.arg,
-            "type": ast.unparse(kwarg.annotation) if kwarg.annotation else None,
-            "default": ast.unparse(default) if default else None
+            "type": _render_expr(kwarg.annotation, lines) if kwarg.annotation else None,
+            "default": _render_expr(default, lines) if default else None
         })
 
     # **kwargs
-    if node.args.kwarg:
-        args_info.append({
-            "name": f"**{node.args.kwarg.arg}",
-            "type": ast.unparse(node.args.kwarg.annotation) if node.args.kwarg.annotation else None,
+    kwarg_node = arguments.kwarg
+    if kwarg_node:
+        append({
+            "name": f"**{kwarg_node.arg}",
+            "type": _render_expr(kwarg_node.annotation, lines) if kwarg_node.annotation else None,
             "default": None
         })
 
-    return_type = ast.unparse(node.returns) if node.returns else None
+    return_type = _render_expr(node.returns, lines) if node.returns else None
 
     return {"args": args_info, "returns": return_type}
 
 
+def _iter_statements(body):
+    """
+    Yield every statement reachable from body, descending through compound-
+    statement blocks but never into expressions: definitions and imports
+    only occur at statement level, and expression nodes dominate a typical
+    tree, so skipping them cuts the walk severalfold versus ast.walk.
+    """
+    stack = list(reversed(body))
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node = pop()
+        yield node
+        # Reversed pushes keep the LIFO stack yielding in source order.
+        for name in reversed(node._fields):
+            value = getattr(node, name)
+            # ast list fields are homogeneous; checking the first element is
+            # enough to classify the whole list.
+            if type(value) is list and value:
+                first = value[0]
+                if isinstance(first, ast.stmt):
+                    extend(reversed(value))
+                elif isinstance(first, (ast.excepthandler, ast.match_case)):
+                    for item in reversed(value):
+                        extend(reversed(item.body))
+
+
 def extract_docstrings_and_comments_from_source(source: str):
     """
     Parse Python source and extract documentation:
@@ -62,60 +136,249 @@ def extract_docstrings_and_comments_from_source(source: str):
     - inline comments
     - function signatures (args, types, defaults, return type)
     """
-    tree = ast.parse(source)
+    return _extract_from_tree(ast.parse(source), source)[0]
+
+
+def _extract_from_tree(tree: ast.Module, source: str):
+    """
+    One walk over the tree produces both the docs dict and the import
+    records (ast.walk resumptions are not free on large files, so docs and
+    imports share the pass).
+    """
+    # __comments__ is a single newline-joined string rather than a list:
+    # for the common zero/few-comment case that is one shared empty-string
+    # object per node instead of a list allocation, and consumers split on
+    # demand.
     docs = {
         "__module__": ast.get_docstring(tree),
-        "__comments__": [],
+        "__comments__": "",
     }
+    imports = []
+
+    # Pre-split once for slice-based rendering of annotations and defaults.
+    # Split on "\n" only: str.splitlines also breaks on form feeds, \v and
+    # other unicode separators that the tokenizer does NOT count as line
+    # breaks, which would silently desynchronize this array from AST line
+    # numbers.
+    source_lines = source.split("\n")
 
     # Track spans of classes and functions for attaching comments
     node_spans = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            docs[f"function:{node.name}"] = {
-                "__doc__": ast.get_docstring(node),
-                "__comments__": [],
-                "signature": _get_function_signature(node),
+    # Methods are seen twice (class body first, then as walked FunctionDefs);
+    # their docstring/signature extraction is shared through here.
+    extracted = {}
+
+    for node in _iter_statements(tree.body):
+        node_type = type(node)
+        if node_type in _FUNC_DEF_TYPES:
+            # Build the key once and intern it: it is stored in docs, carried
+            # in the span list, and hashed again for every comment lookup.
+            key = sys.intern(f"function:{node.name}")
+            pair = extracted.get(node)
+            if pair is None:
+                pair = (ast.get_docstring(node), _get_function_signature(node, source_lines))
+            docs[key] = {
+                "__doc__": pair[0],
+                "__comments__": "",
+                "signature": pair[1],
             }
-            node_spans.append((node.lineno, node.end_lineno, f"function:{node.name}", node))
+            node_spans.append((node.lineno, node.end_lineno, key))
 
-        elif isinstance(node, ast.ClassDef):
-            docs[f"class:{node.name}"] = {
+        elif node_type is ast.ClassDef:
+            key = sys.intern(f"class:{node.name}")
+            class_entry = {
                 "__doc__": ast.get_docstring(node),
-                "__comments__": {},
+                "__comments__": "",
             }
-            node_spans.append((node.lineno, node.end_lineno, f"class:{node.name}", node))
+            docs[key] = class_entry
+            node_spans.append((node.lineno, node.end_lineno, key))
 
             # also extract methods
             for body_item in node.body:
-                if isinstance(body_item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    docs[f"class:{node.name}"][f"method:{body_item.name}"] = {
-                        "__doc__": ast.get_docstring(body_item),
-                        "__comments__": [],
-                        "signature": _get_function_signature(body_item),
+                if type(body_item) in _FUNC_DEF_TYPES:
+                    pair = (ast.get_docstring(body_item), _get_function_signature(body_item, source_lines))
+                    extracted[body_item] = pair
+                    class_entry[f"method:{body_item.name}"] = {
+                        "__doc__": pair[0],
+                        "__comments__": "",
+                        "signature": pair[1],
                     }
 
-    # Collect inline comments
-    for tok_type, tok_string, start, _, _ in tokenize.generate_tokens(StringIO(source).readline):
-        if tok_type == tokenize.COMMENT:
-            line_no = start[0]
-            comment_text = tok_string.lstrip("# ").rstrip()
-            attached = False
-            for start_line, end_line, key, node in node_spans:
-                if start_line <= line_no <= end_line:
-                    if key not in docs:
-                        docs[key] = {"__doc__": ast.get_docstring(node), "__comments__": []}
-                    docs[key]["__comments__"].append(comment_text)
-                    attached = True
-                    break
-            if not attached:
-                docs["__comments__"].append(comment_text)
-
-    return docs
+        elif node_type is ast.Import:
+            for alias in node.names:
+                imports.append(alias.name)  # e.g., 'os', 'numpy.linalg'
+
+        elif node_type is ast.ImportFrom:
+            level = node.level or 0
+            module = node.module or ""
+            if node.names:
+                for alias in node.names:
+                    imports.append((level, module, alias.name))
+            else:
+                # from X import *  (rare, but handle)
+                imports.append((level, module, "*"))
+
+    # Sort spans by start line (ties: larger span first) so a bisect finds
+    # the innermost enclosing definition for each comment instead of a
+    # linear scan over every span per comment.
+    node_spans.sort(key=lambda span: (span[0], -span[1]))
+    # Parallel arrays (SoA): the attachment loop below indexes starts/ends/
+    # keys by position, avoiding tuple unpacking per probe and keeping the
+    # bisected starts list contiguous.
+    span_starts = [span[0] for span in node_spans]
+    span_ends = [span[1] for span in node_spans]
+    span_keys = [span[2] for span in node_spans]
+
+    # Collect inline comments; line numbers come from bisecting the
+    # precomputed newline offsets.
+    newline_positions = []
+    pos = source.find("\n")
+    while pos != -1:
+        newline_positions.append(pos)
+        pos = source.find("\n", pos + 1)
+
+    for match in _COMMENT_OR_STRING_RE.finditer(source):
+        comment = match.group(1)
+        if comment is None:
+            continue
+        line_no = bisect_right(newline_positions, match.start(1)) + 1
+        comment_text = comment.lstrip("# ").rstrip()
+        # Every span key was inserted into docs during the walk above, so no
+        # need to re-derive docstrings here. Spans nest cleanly, so walking
+        # outward from the bisect point lands on the innermost match.
+        i = bisect_right(span_starts, line_no) - 1
+        while i >= 0 and span_ends[i] < line_no:
+            i -= 1
+        if i >= 0:
+            docs[span_keys[i]]["__comments__"] += comment_text + "\n"
+        else:
+            docs["__comments__"] += comment_text + "\n"
+
+    return docs, imports
+
+
+# Parsed files keyed by path -> ((st_mtime_ns, st_size), docs, imports).
+# Repeat crawls of unchanged files (Streamlit re-runs, overlapping
+# dependency trees) skip the read and parse entirely. Entries are shared,
+# not copied: callers treat the doc dicts as read-only.
+_PARSE_CACHE: dict = {}
+
+
+def _stat_stamp(filepath: str):
+    """(st_mtime_ns, st_size) for filepath, or None if it cannot be stated."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def cached_file_entry(filepath: str, stamp=None):
+    """
+    Return the cached (docs, imports) pair for filepath while (mtime, size)
+    still match, else None. Pass a stamp the caller already holds to skip
+    the stat.
+    """
+    if stamp is None:
+        stamp = _stat_stamp(filepath)
+    if stamp is None:
+        return None
+    cached = _PARSE_CACHE.get(filepath)
+    if cached is not None and cached[0] == stamp:
+        return cached[1], cached[2]
+    return None
+
+
+def remember_file_entry(filepath: str, docs, imports, stamp) -> None:
+    """
+    Record a (docs, imports) pair parsed elsewhere (e.g. a worker process).
+    The stamp must have been taken BEFORE the read that produced docs:
+    stat-ing afterwards can tag a stale parse with a newer stamp, and that
+    entry would then be served until the file changes again. A stamp taken
+    early is safe - if the file changes mid-parse the stamps mismatch on
+    the next crawl and the entry is simply re-parsed.
+    """
+    if stamp is None:
+        return
+    _PARSE_CACHE[filepath] = (stamp, docs, imports)
+
+
+# On-disk sidecar so the cache survives process restarts (CLI runs, viewer
+# reloads). marshal loads basic dict/list/str trees several times faster
+# than pickle; the leading format int guards against layout changes.
+# IMPORTANT: bump this whenever the shape of the docs dicts or import
+# records changes, or upgraded installs will serve old-schema entries.
+_CACHE_FORMAT = 2
+_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "rtfmlib", "parse-cache.marshal")
+_disk_cache_loaded = False
+
+
+def load_parse_cache() -> None:
+    """Merge the on-disk cache into memory; runs once per process."""
+    global _disk_cache_loaded
+    if _disk_cache_loaded:
+        return
+    _disk_cache_loaded = True
+    try:
+        with open(_CACHE_FILE, "rb") as f:
+            if marshal.load(f) != _CACHE_FORMAT:
+                return
+            data = marshal.load(f)
+    except Exception:
+        return
+    for path, entry in data.items():
+        # Stamps are re-validated against the filesystem on every lookup, so
+        # stale entries cost nothing beyond their memory.
+        _PARSE_CACHE.setdefault(path, entry)
+
+
+def save_parse_cache() -> None:
+    """Write the in-memory cache to the sidecar with an atomic rename."""
+    try:
+        os.makedirs(os.path.dirname(_CACHE_FILE), exist_ok=True)
+        tmp = f"{_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump(_CACHE_FORMAT, f)
+            marshal.dump(_PARSE_CACHE, f)
+        os.replace(tmp, _CACHE_FILE)
+    except Exception:
+        # Cache persistence is best-effort; never fail a crawl over it.
+        pass
+
+
+def prune_parse_cache(live_paths) -> None:
+    """
+    Drop cache entries for files outside live_paths (the set a crawl just
+    visited), so deleted or out-of-tree files stop pinning their docs in a
+    long-lived process.
+    """
+    for path in list(_PARSE_CACHE):
+        if path not in live_paths:
+            del _PARSE_CACHE[path]
+
+
+def extract_file_docs_and_imports(filepath: str):
+    """
+    Parse filepath once and return (docs, imports): plain module names (str)
+    for `import x`, (level, module, name) tuples for from-imports. Served
+    from the parse cache when the file is unchanged.
+    """
+    stamp = _stat_stamp(filepath)
+    entry = cached_file_entry(filepath, stamp)
+    if entry is not None:
+        return entry
+
+    # Read raw bytes once: ast.parse accepts bytes and handles the source
+    # encoding declaration itself, so only the comment tokenizer needs a
+    # decoded string.
+    with open(filepath, "rb") as f:
+        raw = f.read()
+    tree = ast.parse(raw, filename=filepath)
+    docs, imports = _extract_from_tree(tree, raw.decode("utf-8"))
+    remember_file_entry(filepath, docs, imports, stamp)
+    return docs, imports
 
 
 def extract_docstrings_and_comments_from_file(filepath: str):
-    with open(filepath, "r", encoding="utf-8") as f:
-        source = f.read()
-    return extract_docstrings_and_comments_from_source(source)
+    return extract_file_docs_and_imports(filepath)[0]
@@ -8,9 +8,11 @@ SKIP_DIR_NAMES = {
 }
 PY_EXTS = {".py"}
 
+_PY_SUFFIXES = tuple(sorted(PY_EXTS))
+
 
 def is_python_file(path: str) -> bool:
-    return os.path.splitext(path)[1].lower() in PY_EXTS
+    return path.lower().endswith(_PY_SUFFIXES)
 
 
 def ensure_on_sys_path(path: str):